@@ -5,6 +5,7 @@ A linguistic bridge for local agricultural traders
 
 import sys
 import os
+import random
 from pathlib import Path
 
 # Add project root to Python path
@@ -12,12 +13,11 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 import streamlit as st
-from datetime import datetime
 import pandas as pd
 
 # Import services
 from services.translation_service import TranslationService
-from services.market_service import MarketRateService
+from services.market_service import get_market_service
 from config import ConfigManager
 
 # Page configuration
@@ -33,7 +33,7 @@ st.set_page_config(
 def initialize_services():
     """Initialize all services"""
     translation_service = TranslationService()
-    market_service = MarketRateService()
+    market_service = get_market_service()
     config = ConfigManager()
     return translation_service, market_service, config
 
@@ -117,9 +117,32 @@ UI_TRANSLATIONS = {
     }
 }
 
+# Language selector options and role keys (static across reruns)
+LANGUAGES = {
+    'marathi': 'मराठी',
+    'hindi': 'हिंदी', 
+    'english': 'English'
+}
+LANGUAGE_KEYS = list(LANGUAGES.keys())
+ROLE_KEYS = ['buyer', 'seller']
+_TREND_EMOJI = {"up": "📈", "down": "📉", "stable": "➡️"}
+
+# Mock AI negotiation replies; only the chosen template gets formatted
+_AI_RESPONSE_TEMPLATES = (
+    "I understand you're interested in {name}. The current market rate is ₹{price:,.2f}.",
+    "Based on market trends, a fair price range would be ₹{low:,.2f} to ₹{high:,.2f}.",
+    "Let me help you find a mutually beneficial price point.",
+    "Considering the {trend} trend, this seems like a good time to negotiate."
+)
+
+def set_active_language(language: str):
+    """Bind this session's UI translation table for the given language"""
+    # Kept in session state, not a module global: sessions share the process
+    st.session_state.ui_text = UI_TRANSLATIONS.get(language, UI_TRANSLATIONS['english'])
+
 def get_text(key: str) -> str:
     """Get translated text for current language"""
-    return UI_TRANSLATIONS.get(st.session_state.language, UI_TRANSLATIONS['english']).get(key, key)
+    return st.session_state.ui_text.get(key, key)
 
 def render_sidebar():
     """Render sidebar with navigation and language settings"""
@@ -128,35 +151,25 @@ def render_sidebar():
     
     # Language selector
     st.sidebar.subheader(get_text('language_settings'))
-    languages = {
-        'marathi': 'मराठी',
-        'hindi': 'हिंदी', 
-        'english': 'English'
-    }
-    
     selected_lang = st.sidebar.selectbox(
         get_text('select_language'),
-        options=list(languages.keys()),
-        format_func=lambda x: languages[x],
-        index=list(languages.keys()).index(st.session_state.language)
+        options=LANGUAGE_KEYS,
+        format_func=LANGUAGES.__getitem__,
+        index=LANGUAGE_KEYS.index(st.session_state.language)
     )
     
     if selected_lang != st.session_state.language:
         st.session_state.language = selected_lang
+        set_active_language(selected_lang)
         st.rerun()
     
     # Role selector
     st.sidebar.subheader(get_text('select_role'))
-    roles = {
-        'buyer': get_text('buyer'),
-        'seller': get_text('seller')
-    }
-    
     selected_role = st.sidebar.selectbox(
         "",
-        options=list(roles.keys()),
-        format_func=lambda x: roles[x],
-        index=list(roles.keys()).index(st.session_state.user_role)
+        options=ROLE_KEYS,
+        format_func=get_text,
+        index=ROLE_KEYS.index(st.session_state.user_role)
     )
     
     if selected_role != st.session_state.user_role:
@@ -171,28 +184,31 @@ def render_sidebar():
         label_visibility="collapsed"
     )
 
+@st.cache_data(ttl=60, show_spinner=False)
+def build_rates_table(_market_service, version: int, language: str) -> pd.DataFrame:
+    """Build market rates table, cached per data version and UI language"""
+    # Headers come from the language argument, never from session state,
+    # so the cached table always matches its cache key
+    text = UI_TRANSLATIONS.get(language, UI_TRANSLATIONS['english'])
+    
+    # Create DataFrame for display, one column at a time
+    crops = list(_market_service.get_current_rates().values())
+    df = pd.DataFrame({
+        text['crop_name']: [crop.crop_name for crop in crops],
+        text['price']: [f"₹{crop.current_price:,.2f}" for crop in crops],
+        text['unit']: [crop.unit for crop in crops],
+        text['market']: [crop.market_location for crop in crops],
+        text['trend']: [f"{_TREND_EMOJI.get(crop.trend, '➡️')} {crop.trend.title()}" for crop in crops],
+        text['last_updated']: [crop.last_updated_hm for crop in crops]
+    })
+    return df
+
 def render_market_rates_page(market_service):
     """Render market rates page"""
     st.header(get_text('market_rates'))
     st.subheader(get_text('current_prices'))
     
-    # Get current rates
-    rates = market_service.get_current_rates()
-    
-    # Create DataFrame for display
-    data = []
-    for crop in rates.values():
-        trend_emoji = {"up": "📈", "down": "📉", "stable": "➡️"}
-        data.append({
-            get_text('crop_name'): crop.crop_name,
-            get_text('price'): f"₹{crop.current_price:,.2f}",
-            get_text('unit'): crop.unit,
-            get_text('market'): crop.market_location,
-            get_text('trend'): f"{trend_emoji.get(crop.trend, '➡️')} {crop.trend.title()}",
-            get_text('last_updated'): crop.last_updated.strftime("%H:%M")
-        })
-    
-    df = pd.DataFrame(data)
+    df = build_rates_table(market_service, market_service.version, st.session_state.language)
     st.dataframe(df, use_container_width=True, hide_index=True)
     
     # Trending crops section
@@ -216,6 +232,12 @@ def render_market_rates_page(market_service):
         for crop in stable[:3]:
             st.write(f"**{crop.crop_name}**: ₹{crop.current_price:,.2f}")
 
+def render_chat_messages(messages):
+    """Emit one chat bubble per negotiation message"""
+    user_role = st.session_state.user_role
+    for message in messages:
+        st.chat_message("user" if message['role'] == user_role else "assistant").write(message['content'])
+
 def render_negotiation_page(translation_service, market_service):
     """Render negotiation page"""
     st.header(get_text('negotiation'))
@@ -262,34 +284,29 @@ def render_negotiation_page(translation_service, market_service):
         # Chat history
         chat_container = st.container()
         with chat_container:
-            if st.session_state.negotiation_history:
-                for i, message in enumerate(st.session_state.negotiation_history):
-                    if message['role'] == st.session_state.user_role:
-                        st.chat_message("user").write(message['content'])
-                    else:
-                        st.chat_message("assistant").write(message['content'])
+            render_chat_messages(st.session_state.negotiation_history)
         
         # Chat input
         user_input = st.chat_input(get_text('chat_placeholder'))
         
         if user_input:
+            history = st.session_state.negotiation_history
+            rendered_count = len(history)
+            
             # Add user message
-            st.session_state.negotiation_history.append({
+            history.append({
                 'role': st.session_state.user_role,
-                'content': user_input,
-                'timestamp': datetime.now()
+                'content': user_input
             })
             
             # Simple AI response (mock)
-            ai_responses = [
-                f"I understand you're interested in {selected_crop.crop_name}. The current market rate is ₹{selected_crop.current_price:,.2f}.",
-                f"Based on market trends, a fair price range would be ₹{selected_crop.current_price*0.95:,.2f} to ₹{selected_crop.current_price*1.05:,.2f}.",
-                "Let me help you find a mutually beneficial price point.",
-                f"Considering the {selected_crop.trend} trend, this seems like a good time to negotiate."
-            ]
-            
-            import random
-            ai_response = random.choice(ai_responses)
+            ai_response = random.choice(_AI_RESPONSE_TEMPLATES).format(
+                name=selected_crop.crop_name,
+                price=selected_crop.current_price,
+                low=selected_crop.current_price * 0.95,
+                high=selected_crop.current_price * 1.05,
+                trend=selected_crop.trend
+            )
             
             # Translate AI response if needed
             if st.session_state.language != 'english':
@@ -298,26 +315,28 @@ def render_negotiation_page(translation_service, market_service):
                 except:
                     pass  # Keep original if translation fails
             
-            st.session_state.negotiation_history.append({
+            history.append({
                 'role': 'ai_assistant',
-                'content': ai_response,
-                'timestamp': datetime.now()
+                'content': ai_response
             })
             
-            st.rerun()
+            # Append only the new messages instead of rerunning the whole page
+            with chat_container:
+                render_chat_messages(history[rendered_count:])
 
 def main():
     """Main application function"""
     # Initialize
     initialize_session_state()
+    set_active_language(st.session_state.language)
     
     try:
         translation_service, market_service, config = initialize_services()
     except Exception as e:
         st.error(f"Failed to initialize services: {str(e)}")
         st.info("The application will run with limited functionality.")
-        # Create fallback services
-        market_service = MarketRateService()
+        # Create fallback services (shares the cached market service)
+        market_service = get_market_service()
         translation_service = None
     
     # Render sidebar and get selected page
@@ -5,12 +5,26 @@ This module defines the data structure for crop pricing information
 including current rates, market location, and trend data.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+import time
 from typing import List, Optional
 
+import numpy as np
 
-@dataclass
+
+# Random generator for mock historical prices
+_rng = np.random.default_rng()
+
+# Trend indicator symbols, shared by all CropRate instances
+_TREND_SYMBOLS = {
+    "up": "↑",
+    "down": "↓", 
+    "stable": "→"
+}
+
+
+@dataclass(slots=True)
 class CropRate:
     """Data model for crop market rate information."""
     
@@ -21,9 +35,11 @@ class CropRate:
     last_updated: datetime
     trend: str  # "up", "down", "stable"
     historical_data: Optional[List[float]] = None
+    last_updated_hm: str = field(init=False, repr=False, compare=False)  # "HH:MM" of last_updated
+    last_updated_ts: float = field(init=False, repr=False, compare=False)  # Epoch seconds of last_updated
     
     def __post_init__(self):
-        """Validate data after initialization."""
+        """Validate data and fill in mock historical prices after initialization."""
         if self.current_price < 0:
             raise ValueError("Current price cannot be negative")
         
@@ -38,6 +54,24 @@ class CropRate:
         
         if not self.market_location.strip():
             raise ValueError("Market location cannot be empty")
+        
+        if self.historical_data is None:
+            # Generate some mock historical data
+            base_price = self.current_price
+            self.historical_data = (base_price + _rng.uniform(-200, 200, size=7)).tolist()
+        
+        self.set_last_updated(self.last_updated)
+    
+    def set_last_updated(self, last_updated: datetime) -> None:
+        """
+        Set the update time and refresh the values derived from it.
+        
+        Args:
+            last_updated (datetime): Time the rate was last updated
+        """
+        self.last_updated = last_updated
+        self.last_updated_hm = last_updated.strftime("%H:%M")
+        self.last_updated_ts = last_updated.timestamp()
     
     def get_price_per_unit(self) -> str:
         """
@@ -55,12 +89,7 @@ class CropRate:
         Returns:
             str: Trend symbol (↑, ↓, →)
         """
-        trend_symbols = {
-            "up": "↑",
-            "down": "↓", 
-            "stable": "→"
-        }
-        return trend_symbols.get(self.trend, "→")
+        return _TREND_SYMBOLS.get(self.trend, "→")
     
     def is_data_fresh(self, max_age_hours: int = 24) -> bool:
         """
@@ -72,5 +101,4 @@ class CropRate:
         Returns:
             bool: True if data is fresh, False otherwise
         """
-        age = datetime.now() - self.last_updated
-        return age.total_seconds() < (max_age_hours * 3600)
\ No newline at end of file
+        return (time.time() - self.last_updated_ts) < (max_age_hours * 3600)
\ No newline at end of file
@@ -3,112 +3,114 @@ Market Rate Service for Multilingual Mandi
 Provides current and historical market pricing data
 """
 
-from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import random
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional
+import numpy as np
+import streamlit as st
+from models.crop_rate import CropRate
 
-@dataclass
-class CropRate:
-    """Data model for crop pricing information"""
-    crop_name: str
-    current_price: float
-    unit: str
-    market_location: str
-    last_updated: datetime
-    trend: str  # "up", "down", "stable"
-    historical_data: List[float] = None
+# Shared random generator for mock price updates
+_rng = np.random.default_rng()
+
+def _build_mock_data() -> Dict[str, CropRate]:
+    """Initialize mock data for Indian agricultural markets"""
+    current_time = datetime.now()
+    
+    mock_crops = {
+        "wheat": CropRate(
+            crop_name="Wheat (गहूं)",
+            current_price=2500.0,
+            unit="quintal",
+            market_location="Pune Mandi",
+            last_updated=current_time,
+            trend="up"
+        ),
+        "rice": CropRate(
+            crop_name="Rice (चावल)",
+            current_price=3200.0,
+            unit="quintal", 
+            market_location="Mumbai Mandi",
+            last_updated=current_time,
+            trend="stable"
+        ),
+        "onion": CropRate(
+            crop_name="Onion (कांदा)",
+            current_price=1800.0,
+            unit="quintal",
+            market_location="Nashik Mandi",
+            last_updated=current_time,
+            trend="down"
+        ),
+        "tomato": CropRate(
+            crop_name="Tomato (टमाटर)",
+            current_price=2200.0,
+            unit="quintal",
+            market_location="Pune Mandi", 
+            last_updated=current_time,
+            trend="up"
+        ),
+        "potato": CropRate(
+            crop_name="Potato (बटाटा)",
+            current_price=1500.0,
+            unit="quintal",
+            market_location="Delhi Mandi",
+            last_updated=current_time,
+            trend="stable"
+        ),
+        "sugarcane": CropRate(
+            crop_name="Sugarcane (ऊस)",
+            current_price=350.0,
+            unit="quintal",
+            market_location="Kolhapur Mandi",
+            last_updated=current_time,
+            trend="up"
+        ),
+        "cotton": CropRate(
+            crop_name="Cotton (कापूस)",
+            current_price=5800.0,
+            unit="quintal",
+            market_location="Nagpur Mandi",
+            last_updated=current_time,
+            trend="down"
+        ),
+        "soybean": CropRate(
+            crop_name="Soybean (सोयाबीन)",
+            current_price=4200.0,
+            unit="quintal",
+            market_location="Indore Mandi",
+            last_updated=current_time,
+            trend="stable"
+        )
+    }
     
-    def __post_init__(self):
-        if self.historical_data is None:
-            # Generate some mock historical data
-            base_price = self.current_price
-            self.historical_data = [
-                base_price + random.uniform(-200, 200) for _ in range(7)
-            ]
+    return mock_crops
 
 class MarketRateService:
     """Service for managing market rate data"""
     
     def __init__(self):
-        self.mock_data = self._initialize_mock_data()
+        self.mock_data = _build_mock_data()
+        self._version = 0  # Bumped whenever mock_data changes
+        self._by_trend = self._build_trend_index()
+        # Lowercased names for search; crop names don't change on price updates
+        self._search_index = [(crop.crop_name.lower(), crop) for crop in self.mock_data.values()]
     
-    def _initialize_mock_data(self) -> Dict[str, CropRate]:
-        """Initialize mock data for Indian agricultural markets"""
-        current_time = datetime.now()
-        
-        mock_crops = {
-            "wheat": CropRate(
-                crop_name="Wheat (गहूं)",
-                current_price=2500.0,
-                unit="quintal",
-                market_location="Pune Mandi",
-                last_updated=current_time,
-                trend="up"
-            ),
-            "rice": CropRate(
-                crop_name="Rice (चावल)",
-                current_price=3200.0,
-                unit="quintal", 
-                market_location="Mumbai Mandi",
-                last_updated=current_time,
-                trend="stable"
-            ),
-            "onion": CropRate(
-                crop_name="Onion (कांदा)",
-                current_price=1800.0,
-                unit="quintal",
-                market_location="Nashik Mandi",
-                last_updated=current_time,
-                trend="down"
-            ),
-            "tomato": CropRate(
-                crop_name="Tomato (टमाटर)",
-                current_price=2200.0,
-                unit="quintal",
-                market_location="Pune Mandi", 
-                last_updated=current_time,
-                trend="up"
-            ),
-            "potato": CropRate(
-                crop_name="Potato (बटाटा)",
-                current_price=1500.0,
-                unit="quintal",
-                market_location="Delhi Mandi",
-                last_updated=current_time,
-                trend="stable"
-            ),
-            "sugarcane": CropRate(
-                crop_name="Sugarcane (ऊस)",
-                current_price=350.0,
-                unit="quintal",
-                market_location="Kolhapur Mandi",
-                last_updated=current_time,
-                trend="up"
-            ),
-            "cotton": CropRate(
-                crop_name="Cotton (कापूस)",
-                current_price=5800.0,
-                unit="quintal",
-                market_location="Nagpur Mandi",
-                last_updated=current_time,
-                trend="down"
-            ),
-            "soybean": CropRate(
-                crop_name="Soybean (सोयाबीन)",
-                current_price=4200.0,
-                unit="quintal",
-                market_location="Indore Mandi",
-                last_updated=current_time,
-                trend="stable"
-            )
-        }
-        
-        return mock_crops
+    def _build_trend_index(self) -> Dict[str, List[CropRate]]:
+        """Group crops into per-trend buckets for constant-time trend lookups"""
+        by_trend = {"up": [], "down": [], "stable": []}
+        for crop in self.mock_data.values():
+            by_trend[crop.trend].append(crop)
+        return by_trend
     
-    def get_current_rates(self) -> Dict[str, CropRate]:
-        """Get all current market rates"""
-        return self.mock_data.copy()
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever the market data is updated"""
+        return self._version
+    
+    def get_current_rates(self) -> Mapping[str, CropRate]:
+        """Get all current market rates as a read-only view"""
+        return MappingProxyType(self.mock_data)
     
     def get_rate_by_crop(self, crop_name: str) -> Optional[CropRate]:
         """
@@ -141,21 +143,27 @@ class MarketRateService:
     
     def update_mock_data(self):
         """Update mock data with slight price variations"""
-        for crop_key, crop in self.mock_data.items():
-            # Simulate price fluctuations
-            variation = random.uniform(-0.05, 0.05)  # ±5% variation
-            new_price = crop.current_price * (1 + variation)
+        crops = list(self.mock_data.values())
+        
+        # Simulate price fluctuations for all crops at once
+        prices = np.array([crop.current_price for crop in crops])
+        variations = _rng.uniform(-0.05, 0.05, size=len(crops))  # ±5% variation
+        new_prices = np.round(prices * (1 + variations), 2)
+        
+        # Moves within 0.5% of the old price count as stable
+        deltas = new_prices - prices
+        trends = np.where(np.abs(deltas) < prices * 0.005, "stable", np.where(deltas > 0, "up", "down"))
+        
+        current_time = datetime.now()
+        for crop, new_price, trend in zip(crops, new_prices.tolist(), trends.tolist()):
+            # Keep the trend index in sync
+            if trend != crop.trend:
+                self._by_trend[crop.trend].remove(crop)
+                self._by_trend[trend].append(crop)
             
-            # Update price and trend
-            if new_price > crop.current_price:
-                crop.trend = "up"
-            elif new_price < crop.current_price:
-                crop.trend = "down"
-            else:
-                crop.trend = "stable"
-                
-            crop.current_price = round(new_price, 2)
-            crop.last_updated = datetime.now()
+            crop.trend = trend
+            crop.current_price = new_price
+            crop.set_last_updated(current_time)
             
             # Add to historical data
             if crop.historical_data:
@@ -163,6 +171,8 @@ class MarketRateService:
                 # Keep only last 30 days
                 if len(crop.historical_data) > 30:
                     crop.historical_data = crop.historical_data[-30:]
+        
+        self._version += 1
     
     def search_crops(self, query: str) -> List[CropRate]:
         """
@@ -175,13 +185,7 @@ class MarketRateService:
             List of matching crops
         """
         query = query.lower()
-        results = []
-        
-        for crop in self.mock_data.values():
-            if query in crop.crop_name.lower():
-                results.append(crop)
-                
-        return results
+        return [crop for name, crop in self._search_index if query in name]
     
     def get_trending_crops(self, trend_type: str = "up") -> List[CropRate]:
         """
@@ -191,6 +195,16 @@ class MarketRateService:
             trend_type: "up", "down", or "stable"
             
         Returns:
-            List of crops with the specified trend
+            List of crops with the specified trend (shared, do not modify)
         """
-        return [crop for crop in self.mock_data.values() if crop.trend == trend_type]
\ No newline at end of file
+        return self._by_trend.get(trend_type, [])
+
+@st.cache_resource
+def get_market_service() -> MarketRateService:
+    """
+    Get the process-wide market rate service
+    
+    The crops, trend index, search index and version live on one cached
+    instance, so every caller sees the same data and derived state.
+    """
+    return MarketRateService()
\ No newline at end of file
@@ -3,7 +3,11 @@ Translation Service for Multilingual Mandi
 Provides high-level translation management with caching and optimization
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+import re
+import threading
+from cachetools import TTLCache
 import streamlit as st
 from .gemini_client import GeminiClient
 import sys
@@ -13,8 +17,65 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import ConfigManager
 
+# Process-wide translations keyed by (text, target, source), shared by
+# translate() and batch_translate() across all user sessions
+_translations = TTLCache(maxsize=10000, ttl=24 * 60 * 60)
+
+# Recently failed (text, target, source) translations. Gemini errors are
+# mostly transient (rate limits, timeouts), so failures are only remembered
+# for a few minutes: long enough to stop every rerun re-sending them, short
+# enough that text is translated again soon after Gemini recovers.
+_recent_misses = TTLCache(maxsize=1000, ttl=5 * 60)
+
+_cache_lock = threading.Lock()  # Sessions run on separate threads
+
+def _cached_translation(key: Tuple[str, str, str]) -> Optional[str]:
+    """Get a stored translation, or None if this key hasn't been translated"""
+    with _cache_lock:
+        return _translations.get(key)
+
+def _store_translation(key: Tuple[str, str, str], translated: str):
+    """Store a successful translation for all sessions"""
+    with _cache_lock:
+        _translations[key] = translated
+        _recent_misses.pop(key, None)
+
+def _is_recent_miss(key: Tuple[str, str, str]) -> bool:
+    """Check whether translating this key failed within the last few minutes"""
+    with _cache_lock:
+        return key in _recent_misses
+
+def _record_miss(key: Tuple[str, str, str]):
+    """Remember a failed translation so it is not retried right away"""
+    with _cache_lock:
+        _recent_misses[key] = True
+
+# Any Latin letter marks text as English for the simple detection heuristic
+_ASCII_ALPHA = re.compile(r'[A-Za-z]')
+
+# Devanagari block, the script shared by Marathi and Hindi
+_DEVANAGARI = re.compile(r'[\u0900-\u097F]')
+
+@lru_cache(maxsize=4096)
+def _detect_language(text: str, target_language: Optional[str] = None) -> str:
+    """Memoized language detection heuristic shared by all service instances"""
+    # Pure ASCII (including digits/punctuation only) needs no English translation
+    if target_language == 'english' and text.isascii():
+        return 'english'
+    
+    # Simple heuristic - can be improved with actual detection
+    # For now, assume English if contains mostly Latin characters
+    if text and _ASCII_ALPHA.search(text):
+        return 'english'
+    
+    # Marathi and Hindi can't be told apart by script, so Devanagari text is
+    # treated as already being in either target rather than sent to Gemini
+    if target_language in ('hindi', 'marathi') and _DEVANAGARI.search(text):
+        return target_language
+    return 'marathi'  # Default to Marathi
+
 class TranslationService:
-    """High-level translation service with session caching"""
+    """High-level translation service with shared caching"""
     
     def __init__(self):
         self.config = ConfigManager()
@@ -25,10 +86,6 @@ class TranslationService:
             'hindi': 'hi', 
             'english': 'en'
         }
-        
-        # Initialize session state for caching
-        if 'translation_cache' not in st.session_state:
-            st.session_state.translation_cache = {}
             
         # Initialize Gemini client if API key is available
         try:
@@ -57,35 +114,37 @@ class TranslationService:
         if target_language not in self.supported_languages:
             return text
             
-        # Check cache first
-        cache_key = f"{text}_{target_language}"
-        if cache_key in st.session_state.translation_cache:
-            return st.session_state.translation_cache[cache_key]
-        
         # If no Gemini client, return original text
         if not self.gemini_client:
             return text
             
+        # Detect source language (simplified)
+        source_lang = self.detect_language(text, target_language)
+        
+        # Skip translation if already in target language
+        if source_lang == target_language:
+            return text
+        
+        # Check the shared cache, and don't retry a translation that failed
+        # moments ago
+        key = (text, target_language, source_lang)
+        cached = _cached_translation(key)
+        if cached is not None:
+            return cached
+        if _is_recent_miss(key):
+            return text
+        
         try:
-            # Detect source language (simplified)
-            source_lang = self.detect_language(text)
-            
-            # Skip translation if already in target language
-            if source_lang == target_language:
-                return text
-                
             # Translate using Gemini
             translated = self.gemini_client.translate_text(
                 text, 
                 source_lang, 
                 target_language
             )
-            
-            # Cache the result
-            st.session_state.translation_cache[cache_key] = translated
+            _store_translation(key, translated)
             return translated
-            
         except Exception as e:
+            _record_miss(key)
             st.error(f"Translation failed: {str(e)}")
             return text
     
@@ -93,21 +152,19 @@ class TranslationService:
         """Get list of supported languages"""
         return self.supported_languages.copy()
     
-    def detect_language(self, text: str) -> str:
+    def detect_language(self, text: str, target_language: Optional[str] = None) -> str:
         """
         Simple language detection (can be enhanced)
         
         Args:
             text: Text to analyze
+            target_language: Intended target language, if any; text that is
+                cheaply recognisable as already in it is reported as such
             
         Returns:
             Detected language code
         """
-        # Simple heuristic - can be improved with actual detection
-        # For now, assume English if contains mostly Latin characters
-        if text and any(ord(char) < 128 for char in text if char.isalpha()):
-            return 'english'
-        return 'marathi'  # Default to Marathi
+        return _detect_language(text, target_language)
     
     def batch_translate(self, texts: List[str], target_language: str) -> List[str]:
         """
@@ -120,9 +177,55 @@ class TranslationService:
         Returns:
             List of translated texts
         """
-        return [self.translate(text, target_language) for text in texts]
+        target_language = target_language.lower()
+        if not self.gemini_client or target_language not in self.supported_languages:
+            return list(texts)
+        
+        results = list(texts)
+        
+        # Fill cache hits directly; group the misses by source language,
+        # keeping the positions of each distinct text so results go back in
+        # input order
+        pending: Dict[str, Dict[str, List[int]]] = {}
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                continue
+            source_lang = self.detect_language(text, target_language)
+            if source_lang == target_language:
+                continue
+            key = (text, target_language, source_lang)
+            cached = _cached_translation(key)
+            if cached is not None:
+                results[i] = cached
+            elif not _is_recent_miss(key):
+                pending.setdefault(source_lang, {}).setdefault(text, []).append(i)
+        
+        # One Gemini round-trip per source language for the misses only
+        failure = None
+        for source_lang, positions in pending.items():
+            batch = list(positions)
+            try:
+                translated = self.gemini_client.batch_translate(batch, source_lang, target_language)
+            except Exception as e:
+                # The client has already retried these texts one by one, so
+                # keep the originals and let the miss TTL retry them later
+                for text in batch:
+                    _record_miss((text, target_language, source_lang))
+                failure = e
+                continue
+            
+            for text, result in zip(batch, translated):
+                _store_translation((text, target_language, source_lang), result)
+                for i in positions[text]:
+                    results[i] = result
+        
+        if failure is not None:
+            st.error(f"Translation failed: {str(failure)}")
+        
+        return results
     
     def clear_cache(self):
         """Clear translation cache"""
-        if 'translation_cache' in st.session_state:
-            st.session_state.translation_cache.clear()
\ No newline at end of file
+        with _cache_lock:
+            _translations.clear()
+            _recent_misses.clear()
\ No newline at end of file